@@ -5,6 +5,13 @@
 #include <QFile>
 #include <QElapsedTimer>
 #include <QCoreApplication>
+#include <cstring>
+
+// SSE2 is part of the x86-64 baseline; GCC/Clang define __SSE2__, MSVC does not
+#if defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#include <emmintrin.h>
+#define DEVICEPROTOCOL_HAVE_SSE2 1
+#endif
 
 DeviceProtocol::DeviceProtocol(QObject *parent)
     : QObject(parent)
@@ -74,9 +81,58 @@ QString DeviceProtocol::portName() const
 
 quint8 DeviceProtocol::calculateChecksum(const QByteArray &data) const
 {
+    const uchar *p = reinterpret_cast<const uchar *>(data.constData());
+    qsizetype remaining = data.size();
     quint8 checksum = 0;
-    for (char byte : data) {
-        checksum ^= static_cast<quint8>(byte);
+
+    // Four independent accumulators so consecutive XORs don't wait on each
+    // other; they are combined once at the end
+#ifdef DEVICEPROTOCOL_HAVE_SSE2
+    // XOR 16 bytes per instruction, then fold the lanes down to one byte
+    if (remaining >= 16) {
+        __m128i acc0 = _mm_setzero_si128();
+        __m128i acc1 = _mm_setzero_si128();
+        __m128i acc2 = _mm_setzero_si128();
+        __m128i acc3 = _mm_setzero_si128();
+        for (; remaining >= 64; remaining -= 64, p += 64) {
+            acc0 = _mm_xor_si128(acc0, _mm_loadu_si128(reinterpret_cast<const __m128i *>(p)));
+            acc1 = _mm_xor_si128(acc1, _mm_loadu_si128(reinterpret_cast<const __m128i *>(p + 16)));
+            acc2 = _mm_xor_si128(acc2, _mm_loadu_si128(reinterpret_cast<const __m128i *>(p + 32)));
+            acc3 = _mm_xor_si128(acc3, _mm_loadu_si128(reinterpret_cast<const __m128i *>(p + 48)));
+        }
+        for (; remaining >= 16; remaining -= 16, p += 16) {
+            acc0 = _mm_xor_si128(acc0, _mm_loadu_si128(reinterpret_cast<const __m128i *>(p)));
+        }
+        __m128i acc = _mm_xor_si128(_mm_xor_si128(acc0, acc1), _mm_xor_si128(acc2, acc3));
+        acc = _mm_xor_si128(acc, _mm_srli_si128(acc, 8));
+        acc = _mm_xor_si128(acc, _mm_srli_si128(acc, 4));
+        acc = _mm_xor_si128(acc, _mm_srli_si128(acc, 2));
+        acc = _mm_xor_si128(acc, _mm_srli_si128(acc, 1));
+        checksum = static_cast<quint8>(_mm_cvtsi128_si32(acc));
+    }
+#else
+    // Same idea with 64-bit words (memcpy keeps unaligned loads well-defined)
+    if (remaining >= 32) {
+        quint64 acc0 = 0, acc1 = 0, acc2 = 0, acc3 = 0;
+        for (; remaining >= 32; remaining -= 32, p += 32) {
+            quint64 words[4];
+            std::memcpy(words, p, sizeof(words));
+            acc0 ^= words[0];
+            acc1 ^= words[1];
+            acc2 ^= words[2];
+            acc3 ^= words[3];
+        }
+        quint64 acc = acc0 ^ acc1 ^ acc2 ^ acc3;
+        acc ^= acc >> 32;
+        acc ^= acc >> 16;
+        acc ^= acc >> 8;
+        checksum = static_cast<quint8>(acc);
+    }
+#endif
+
+    // Tail bytes
+    for (; remaining > 0; --remaining) {
+        checksum ^= *p++;
     }
     return checksum;
 }
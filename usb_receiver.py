@@ -19,9 +19,18 @@ import sys
 import argparse
 import time
 import os
+import queue
+import select
+import threading
+import zlib
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Protocol Constants
 USB_PROTO_MAGIC = 0xAA55
 USB_PROTO_CMD_HANDSHAKE = 0x01
@@ -33,21 +42,105 @@ USB_PROTO_CMD_NACK = 0x06
 
 USB_CHUNK_SIZE = 512
 USB_TIMEOUT = 30.0  # seconds - give user time to prepare
+USB_READ_SIZE = 4096  # bytes requested per raw os.read()
+PROGRESS_INTERVAL = 0.05  # seconds between progress line updates
+WRITE_QUEUE_DEPTH = 32  # chunks buffered ahead of the disk writer thread
+
+# Native USB CDC ignores the baudrate, but some host drivers size their
+# buffering from it, so default to the fastest common UART rate
+USB_DEFAULT_BAUDRATE = 921600
+
+ASYNC_LOW_LATENCY = 0x2000  # serial_struct.flags bit, linux/tty_flags.h
+
+# Chunks acknowledged per ACK. Values above 1 need firmware that accepts
+# cumulative ACKs (one ACK covering the last N chunks), so 1 stays the default
+USB_ACK_WINDOW = 1
+
+# Header checksum field formats: XOR-8 (current firmware) or CRC32, which
+# needs firmware built with the CRC32 protocol variant
+USB_HEADER_FORMAT = '<HBHB'        # magic(2) + command(1) + length(2) + xor(1)
+USB_HEADER_FORMAT_CRC32 = '<HBHI'  # magic(2) + command(1) + length(2) + crc32(4)
+
+# Precompiled packet layouts, so hot paths don't re-parse format strings
+_HEADER_STRUCT = struct.Struct(USB_HEADER_FORMAT)
+_HEADER_CRC32_STRUCT = struct.Struct(USB_HEADER_FORMAT_CRC32)
+_INFO_STRUCT = struct.Struct('<BI')       # version/file_index(1) + timestamp/file_size(4)
+_CHUNK_HDR_STRUCT = struct.Struct('<HH')  # chunk_number(2) + chunk_size(2)
+
+# Below this size building an ndarray costs more than the integer fold
+CHECKSUM_NUMPY_MIN_LEN = 32
+
+class ChunkWriter:
+    """Write chunks to a file from a background thread.
+    
+    Lets a slow disk (e.g. SD card) write the previous chunk while the next
+    one is read from the serial port. Write errors are raised from the next
+    write() or from close().
+    """
+    
+    def __init__(self, f, depth=WRITE_QUEUE_DEPTH):
+        """Start the writer thread.
+        
+        Args:
+            f: Binary file object to write to
+            depth: Maximum number of chunks queued before write() blocks
+        """
+        self.f = f
+        self.error = None
+        self.queue = queue.Queue(maxsize=depth)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def run(self):
+        """Writer thread: drain the queue until the None sentinel."""
+        while (chunk := self.queue.get()) is not None:
+            if self.error is None:
+                try:
+                    self.f.write(chunk)
+                except OSError as e:
+                    self.error = e
+    
+    def write(self, data):
+        """Queue a copy of data for writing."""
+        if self.error is not None:
+            raise self.error
+        self.queue.put(bytes(data))
+    
+    def close(self):
+        """Wait for all queued chunks to be written."""
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
 
 class USBReceiver:
-    def __init__(self, port, output_dir, baudrate=115200):
+    def __init__(self, port, output_dir, baudrate=USB_DEFAULT_BAUDRATE,
+                 ack_window=USB_ACK_WINDOW, crc32=False):
         """Initialize USB receiver.
         
         Args:
             port: Serial port name (e.g., /dev/ttyACM0 or COM3)
             output_dir: Directory to save received files
-            baudrate: Serial baudrate (default 115200)
+            baudrate: Serial baudrate (default 921600)
+            ack_window: Chunks per cumulative ACK (default 1, ACK every chunk)
+            crc32: Use 4-byte CRC32 packet checksums instead of XOR-8
         """
         self.port = port
         self.output_dir = Path(output_dir)
         self.baudrate = baudrate
+        self.ack_window = max(1, ack_window)
+        self.crc32 = crc32
+        self._header_struct = _HEADER_CRC32_STRUCT if crc32 else _HEADER_STRUCT
         self.ser = None
         self.files_received = 0
+        self._rx_buf = bytearray()  # Bytes read ahead of the current packet
+        self._fd = None  # Raw port descriptor on POSIX, None elsewhere
+        # Reused for every chunk payload: chunk_number(2) + chunk_size(2) + data
+        self._chunk_buf = bytearray(4 + USB_CHUNK_SIZE)
+        
+        # ACK/NACK never change, so build them once instead of per chunk
+        self._ack_packet = self.build_packet(USB_PROTO_CMD_ACK, b'')
+        self._nack_packet = self.build_packet(USB_PROTO_CMD_NACK, b'')
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -56,6 +149,10 @@ class USBReceiver:
         print(f"  Port: {port}")
         print(f"  Output directory: {self.output_dir.absolute()}")
         print(f"  Baudrate: {baudrate}")
+        if self.ack_window > 1:
+            print(f"  ACK window: {self.ack_window} chunks")
+        if self.crc32:
+            print(f"  Checksum: CRC32")
     
     def connect(self):
         """Open serial port connection."""
@@ -67,53 +164,200 @@ class USBReceiver:
                 write_timeout=USB_TIMEOUT
             )
             print(f"✓ Connected to {self.port}")
+            self.enable_low_latency()
             # Flush any existing data
             self.ser.reset_input_buffer()
             self.ser.reset_output_buffer()
+            self._rx_buf.clear()
+            
+            # Read the tty directly where possible (not on Windows)
+            try:
+                self._fd = self.ser.fileno()
+            except (AttributeError, OSError):
+                self._fd = None
             return True
         except serial.SerialException as e:
             print(f"✗ Failed to open port {self.port}: {e}")
             return False
     
+    def enable_low_latency(self):
+        """Ask the tty driver to deliver received bytes immediately.
+        
+        By default Linux batches USB serial input for up to ~16 ms, which
+        is added to every chunk round-trip. Failure is not fatal.
+        """
+        if os.name == 'nt':
+            return  # No tty low-latency flag on Windows
+        
+        try:
+            try:
+                self.ser.set_low_latency_mode(True)
+            except AttributeError:
+                # Older pyserial has no helper; set the flag directly
+                self.set_async_low_latency()
+            print("✓ Low-latency mode enabled")
+        except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+            print(f"  Low-latency mode not available: {e}")
+    
+    def set_async_low_latency(self):
+        """Set ASYNC_LOW_LATENCY via TIOCGSERIAL/TIOCSSERIAL (Linux only)."""
+        import array
+        import fcntl
+        import termios
+        
+        # struct serial_struct as ints; flags is the fifth field
+        buf = array.array('i', [0] * 32)
+        fd = self.ser.fileno()
+        fcntl.ioctl(fd, termios.TIOCGSERIAL, buf)
+        buf[4] |= ASYNC_LOW_LATENCY
+        fcntl.ioctl(fd, termios.TIOCSSERIAL, buf)
+    
     def disconnect(self):
         """Close serial port connection."""
+        self._fd = None
         if self.ser and self.ser.is_open:
             self.ser.close()
             print("✓ Disconnected")
     
     def calculate_checksum(self, data):
-        """Calculate XOR checksum of data.
+        """Calculate packet checksum of data.
         
         Args:
             data: bytes to checksum
             
         Returns:
-            uint8 checksum value
+            uint8 XOR checksum value, or uint32 CRC32 in CRC32 mode
         """
-        checksum = 0
-        for byte in data:
-            checksum ^= byte
+        if self.crc32:
+            return zlib.crc32(data) & 0xFFFFFFFF
+        
+        if np is not None and len(data) >= CHECKSUM_NUMPY_MIN_LEN:
+            arr = np.frombuffer(data, dtype=np.uint8)
+            return int(np.bitwise_xor.reduce(arr)) & 0xFF
+        
+        # Without NumPy, treat the data as one big integer and fold it in
+        # half repeatedly: each XOR/shift runs in C over the whole buffer,
+        # so the loop runs log2(len) times instead of once per byte
+        checksum = int.from_bytes(data, 'little')
+        width = 8
+        while width < len(data) * 8:
+            width <<= 1
+        while width > 8:
+            width >>= 1
+            checksum = (checksum ^ (checksum >> width)) & ((1 << width) - 1)
         return checksum & 0xFF
     
+    def build_packet(self, command, data):
+        """Build a complete packet.
+        
+        Args:
+            command: Protocol command byte
+            data: Packet payload bytes
+            
+        Returns:
+            bytes: header + data
+        """
+        packet = self._header_struct.pack(USB_PROTO_MAGIC, command, len(data),
+                                          self.calculate_checksum(data))
+        return packet + data
+    
     def send_ack(self):
-        """Send ACK packet to ESP32."""
-        # Packet: magic(2) + command(1) + length(2) + checksum(1)
-        packet = struct.pack('<HBH', USB_PROTO_MAGIC, USB_PROTO_CMD_ACK, 0)
-        checksum = self.calculate_checksum(packet[6:])  # Checksum of data (empty)
-        packet += struct.pack('B', checksum)
+        """Send ACK packet to ESP32.
         
-        self.ser.write(packet)
-        self.ser.flush()
+        Not flushed: flush() blocks until the driver drains (tcdrain), and
+        the CDC endpoint sends the packet on its own. receive_file() flushes
+        once after a successful transfer.
+        """
+        self.ser.write(self._ack_packet)
     
     def send_nack(self):
         """Send NACK packet to ESP32."""
-        packet = struct.pack('<HBH', USB_PROTO_MAGIC, USB_PROTO_CMD_NACK, 0)
-        checksum = self.calculate_checksum(packet[6:])
-        packet += struct.pack('B', checksum)
-        
-        self.ser.write(packet)
+        # Flushed, since a NACK usually comes right before the transfer aborts
+        self.ser.write(self._nack_packet)
         self.ser.flush()
     
+    def read_bytes(self, count):
+        """Read count bytes, coalescing serial reads.
+        
+        Whatever is already waiting in the driver is pulled in with the
+        requested bytes, so a header and its payload normally arrive in a
+        single read and the payload is served from the buffer.
+        
+        Args:
+            count: Number of bytes to read
+            
+        Returns:
+            bytes: Data read (shorter than count on timeout)
+        """
+        self.fill_rx_buffer(count)
+        
+        data = bytes(self._rx_buf[:count])
+        del self._rx_buf[:count]
+        return data
+    
+    def read_into(self, view):
+        """Read len(view) bytes into a caller-owned buffer.
+        
+        Like read_bytes(), but copies once from the read-ahead buffer into
+        view instead of allocating a new bytes object per packet.
+        
+        Args:
+            view: Writable buffer (bytearray or memoryview) to fill
+            
+        Returns:
+            int: Number of bytes read (less than len(view) on timeout)
+        """
+        self.fill_rx_buffer(len(view))
+        
+        count = min(len(view), len(self._rx_buf))
+        with memoryview(self._rx_buf) as rx_view:
+            view[:count] = rx_view[:count]
+        del self._rx_buf[:count]
+        return count
+    
+    def fill_rx_buffer(self, count):
+        """Fill the read-ahead buffer to at least count bytes.
+        
+        On POSIX this bypasses pyserial's read() loop: one select() +
+        os.read() of up to USB_READ_SIZE bytes per wakeup, honouring the
+        port's timeout. Elsewhere it falls back to ser.read().
+        
+        Args:
+            count: Number of bytes wanted in the buffer
+        """
+        needed = count - len(self._rx_buf)
+        if needed <= 0:
+            return
+        
+        if self._fd is None:
+            self._rx_buf += self.ser.read(max(needed, self.ser.in_waiting))
+            return
+        
+        timeout = self.ser.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while len(self._rx_buf) < count:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+            
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                break
+            
+            try:
+                data = os.read(self._fd, max(count - len(self._rx_buf), USB_READ_SIZE))
+            except BlockingIOError:
+                continue
+            if not data:
+                # Same condition pyserial reports for an unplugged device
+                raise serial.SerialException(
+                    'device reports readiness to read but returned no data '
+                    '(device disconnected or multiple access on port?)')
+            self._rx_buf += data
+    
     def read_packet_header(self):
         """Read packet header from serial port.
         
@@ -121,13 +365,14 @@ class USBReceiver:
             tuple: (magic, command, length, checksum) or None if invalid
         """
         try:
-            # Read header: magic(2) + command(1) + length(2) + checksum(1)
-            header = self.ser.read(6)
-            if len(header) != 6:
+            # Read header: magic(2) + command(1) + length(2) + checksum(1 or 4)
+            header_size = self._header_struct.size
+            header = self.read_bytes(header_size)
+            if len(header) != header_size:
                 print(f"✗ Incomplete header received (got {len(header)} bytes)")
                 return None
             
-            magic, command, length, checksum = struct.unpack('<HBHB', header)
+            magic, command, length, checksum = self._header_struct.unpack(header)
             
             if magic != USB_PROTO_MAGIC:
                 print(f"✗ Invalid magic number: 0x{magic:04X} (expected 0x{USB_PROTO_MAGIC:04X})")
@@ -148,11 +393,14 @@ class USBReceiver:
             bool: True if handshake received successfully
         """
         print("\nWaiting for handshake from device...")
-        start_time = time.time()
+        deadline = time.time() + timeout
+        saved_timeout = self.ser.timeout
         
-        while time.time() - start_time < timeout:
-            # Check if data available
-            if self.ser.in_waiting > 0:
+        # Block in ser.read() until bytes arrive instead of polling in_waiting,
+        # so the handshake is handled as soon as it lands
+        try:
+            while time.time() < deadline:
+                self.ser.timeout = max(deadline - time.time(), 0)
                 header = self.read_packet_header()
                 if header is None:
                     continue
@@ -161,7 +409,7 @@ class USBReceiver:
                 
                 if command == USB_PROTO_CMD_HANDSHAKE:
                     # Read handshake data: version(1) + timestamp(4)
-                    data = self.ser.read(length)
+                    data = self.read_bytes(length)
                     if len(data) != length:
                         print(f"✗ Incomplete handshake data")
                         self.send_nack()
@@ -175,19 +423,31 @@ class USBReceiver:
                         continue
                     
                     # Parse handshake data
-                    version, timestamp = struct.unpack('<BI', data)
+                    version, timestamp = _INFO_STRUCT.unpack(data)
                     print(f"✓ Handshake received (version: {version}, timestamp: {timestamp})")
                     
                     # Send ACK
                     self.send_ack()
                     print("✓ Handshake ACK sent")
                     return True
-            
-            time.sleep(0.1)
+        finally:
+            self.ser.timeout = saved_timeout
         
         print(f"✗ Handshake timeout after {timeout}s")
         return False
     
+    def decode_filename(self, field):
+        """Decode a fixed-size, null-padded filename field.
+        
+        Args:
+            field: Filename bytes (up to 64, null-terminated or full)
+            
+        Returns:
+            str: Filename with any path prefix (e.g. /data/) removed
+        """
+        filename = field.split(b'\x00', 1)[0].decode('utf-8', errors='replace')
+        return os.path.basename(filename)
+    
     def receive_file_list(self):
         """Receive file list from ESP32.
         
@@ -208,7 +468,7 @@ class USBReceiver:
             return None
         
         # Read file list data: file_count(1) + filenames[8*64]
-        data = self.ser.read(length)
+        data = self.read_bytes(length)
         if len(data) != length:
             print(f"✗ Incomplete file list data")
             self.send_nack()
@@ -225,20 +485,9 @@ class USBReceiver:
         file_count = data[0]
         print(f"✓ File list received: {file_count} files")
         
-        filenames = []
-        for i in range(file_count):
-            offset = 1 + (i * 64)
-            filename_bytes = data[offset:offset + 64]
-            # Find null terminator
-            null_pos = filename_bytes.find(b'\x00')
-            if null_pos >= 0:
-                filename = filename_bytes[:null_pos].decode('utf-8', errors='replace')
-            else:
-                filename = filename_bytes.decode('utf-8', errors='replace')
-            
-            # Extract just the basename (remove /data/ prefix)
-            filename = os.path.basename(filename)
-            filenames.append(filename)
+        filenames = [self.decode_filename(data[1 + i * 64:1 + (i + 1) * 64])
+                     for i in range(file_count)]
+        for i, filename in enumerate(filenames):
             print(f"  [{i+1}] {filename}")
         
         # Send ACK
@@ -270,7 +519,7 @@ class USBReceiver:
             return None
         
         # Read file info: file_index(1) + file_size(4) + filename(64)
-        data = self.ser.read(length)
+        data = self.read_bytes(length)
         if len(data) != length:
             print(f"✗ Incomplete file info data")
             self.send_nack()
@@ -284,94 +533,151 @@ class USBReceiver:
             return None
         
         # Parse file info
-        file_index, file_size = struct.unpack('<BI', data[:5])
-        filename_bytes = data[5:69]
-        null_pos = filename_bytes.find(b'\x00')
-        if null_pos >= 0:
-            filename = filename_bytes[:null_pos].decode('utf-8', errors='replace')
-        else:
-            filename = filename_bytes.decode('utf-8', errors='replace')
-        
-        filename = os.path.basename(filename)  # Remove path prefix
+        file_index, file_size = _INFO_STRUCT.unpack_from(data)
+        filename = self.decode_filename(data[5:69])
         
         print(f"  File index: {file_index}")
         print(f"  File size: {file_size} bytes")
         print(f"  Filename: {filename}")
         
+        # Stream chunks straight to disk under a temporary name, so a failed
+        # transfer never truncates or removes an earlier copy of the file
+        output_path = self.output_dir / filename
+        part_path = output_path.with_name(filename + '.part')
+        try:
+            f = open(part_path, 'wb', buffering=64 * 1024)
+        except OSError as e:
+            print(f"✗ Failed to create file: {e}")
+            self.send_nack()
+            return None
+        
         # Send ACK for file info
         self.send_ack()
         
-        # Receive file chunks
-        file_data = bytearray()
+        success = False
+        try:
+            try:
+                with f:
+                    writer = ChunkWriter(f)
+                    try:
+                        success = self.receive_chunks(writer, file_size)
+                    finally:
+                        writer.close()
+                if success:
+                    part_path.replace(output_path)
+            except serial.SerialException:
+                raise  # Not a disk error; the caller reports it
+            except OSError as e:
+                print(f"\n✗ Failed to save file: {e}")
+                success = False
+        finally:
+            # Also covers errors pyserial doesn't wrap, e.g. termios.error
+            # from the NACK flush after the device went away
+            if not success:
+                part_path.unlink(missing_ok=True)
+        
+        print()  # New line after progress
+        
+        if not success:
+            return None
+        
+        # Make sure the final chunk ACK has left before the next file starts
+        self.ser.flush()
+        print(f"✓ File saved: {output_path}")
+        self.files_received += 1
+        return filename
+    
+    def receive_chunks(self, f, file_size):
+        """Receive file chunks from ESP32 and write them to f.
+        
+        Args:
+            f: File-like object (ChunkWriter) to write chunk data to
+            file_size: Expected file size in bytes
+            
+        Returns:
+            bool: True if all chunks were received
+        """
+        received = 0
         chunk_number = 0
         expected_chunks = (file_size + USB_CHUNK_SIZE - 1) // USB_CHUNK_SIZE
-        
-        while len(file_data) < file_size:
+        ack_window = self.ack_window
+        
+        # Bind per-chunk calls to locals once; attribute lookups are a
+        # noticeable share of the loop's interpreter overhead
+        read_packet_header = self.read_packet_header
+        read_into = self.read_into
+        calculate_checksum = self.calculate_checksum
+        unpack_chunk_header = _CHUNK_HDR_STRUCT.unpack_from
+        write = f.write
+        send_ack = self.send_ack
+        monotonic = time.monotonic
+        last_progress = 0.0
+        
+        # Bounded by bytes received, so no header is read after the last chunk
+        while received < file_size:
             # Read chunk header
-            header = self.read_packet_header()
+            header = read_packet_header()
             if header is None:
                 print(f"✗ Failed to read chunk {chunk_number} header")
                 self.send_nack()
-                return None
+                return False
             
             magic, command, length, header_checksum = header
             
-            # File transfer complete when we've received all bytes
-            if len(file_data) >= file_size:
-                break
-            
             if command != USB_PROTO_CMD_FILE_DATA:
                 print(f"✗ Expected FILE_DATA, got 0x{command:02X}")
                 self.send_nack()
-                return None
+                return False
             
             # Read chunk data: chunk_number(2) + chunk_size(2) + data[512]
-            data = self.ser.read(length)
-            if len(data) != length:
+            # into the reused chunk buffer; checksum and write work on views
+            if length > len(self._chunk_buf):
+                self._chunk_buf = bytearray(length)
+            data = memoryview(self._chunk_buf)[:length]
+            if read_into(data) != length:
                 print(f"✗ Incomplete chunk data")
                 self.send_nack()
-                return None
+                return False
             
             # Verify checksum
-            calc_checksum = self.calculate_checksum(data)
+            calc_checksum = calculate_checksum(data)
             if calc_checksum != header_checksum:
                 print(f"✗ Chunk {chunk_number} checksum mismatch")
                 self.send_nack()
-                return None
+                return False
             
             # Parse chunk
-            recv_chunk_num, chunk_size = struct.unpack('<HH', data[:4])
+            recv_chunk_num, chunk_size = unpack_chunk_header(data)
             chunk_data = data[4:4 + chunk_size]
             
             if recv_chunk_num != chunk_number:
                 print(f"✗ Chunk number mismatch (expected {chunk_number}, got {recv_chunk_num})")
                 self.send_nack()
-                return None
+                return False
             
-            # Append chunk data
-            file_data.extend(chunk_data)
+            chunk_size = len(chunk_data)
+            if received + chunk_size > file_size:
+                print(f"✗ Chunk {chunk_number} overruns file size ({received + chunk_size}/{file_size} bytes)")
+                self.send_nack()
+                return False
+            
+            # Write chunk data
+            write(chunk_data)
+            received += chunk_size
             chunk_number += 1
             
-            # Send ACK for chunk
-            self.send_ack()
+            # Send ACK for chunk, or for the whole window when batching
+            if chunk_number % ack_window == 0 or received >= file_size:
+                send_ack()
             
-            # Progress indicator
-            progress = (len(file_data) / file_size) * 100
-            print(f"  Progress: {progress:.1f}% ({len(file_data)}/{file_size} bytes, chunk {chunk_number}/{expected_chunks})", end='\r')
+            # Progress indicator, throttled so terminal writes stay off the hot path
+            now = monotonic()
+            if now - last_progress >= PROGRESS_INTERVAL or received >= file_size:
+                last_progress = now
+                progress = (received / file_size) * 100
+                print(f"  Progress: {progress:.1f}% ({received}/{file_size} bytes, chunk {chunk_number}/{expected_chunks})", end='\r')
         
-        print()  # New line after progress
-        
-        # Save file
-        output_path = self.output_dir / filename
-        try:
-            with open(output_path, 'wb') as f:
-                f.write(file_data)
-            print(f"✓ File saved: {output_path}")
-            self.files_received += 1
-            return filename
-        except Exception as e:
-            print(f"✗ Failed to save file: {e}")
-            return None
+        return True
     
     def receive_all_files(self):
         """Receive all files from ESP32.
@@ -442,8 +748,12 @@ Examples:
                         help='Serial port (default: /dev/ttyACM0, or COM3 on Windows)')
     parser.add_argument('--output-dir', '-o', default='./received_files',
                         help='Output directory for received files (default: ./received_files)')
-    parser.add_argument('--baudrate', '-b', type=int, default=115200,
-                        help='Serial baudrate (default: 115200)')
+    parser.add_argument('--baudrate', '-b', type=int, default=USB_DEFAULT_BAUDRATE,
+                        help=f'Serial baudrate (default: {USB_DEFAULT_BAUDRATE})')
+    parser.add_argument('--ack-window', type=int, default=USB_ACK_WINDOW,
+                        help='Chunks per cumulative ACK; needs matching firmware (default: 1)')
+    parser.add_argument('--crc32', action='store_true',
+                        help='Use CRC32 packet checksums; needs matching firmware')
     parser.add_argument('--list-ports', '-l', action='store_true',
                         help='List available serial ports and exit')
     
@@ -454,7 +764,8 @@ Examples:
         return 0
     
     # Create receiver (port now has default value)
-    receiver = USBReceiver(args.port, args.output_dir, args.baudrate)
+    receiver = USBReceiver(args.port, args.output_dir, args.baudrate, args.ack_window,
+                           args.crc32)
     
     # Connect to device
     if not receiver.connect():
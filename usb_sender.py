@@ -19,9 +19,16 @@ import sys
 import argparse
 import time
 import os
+import zlib
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Protocol Constants (matching ESP32 firmware)
 USB_PROTO_MAGIC = 0xAA55
 USB_PROTO_CMD_HANDSHAKE = 0x01
@@ -32,27 +39,79 @@ USB_PROTO_CMD_ACK = 0x05
 USB_PROTO_CMD_NACK = 0x06
 USB_PROTO_CMD_CONFIG_REQ = 0x07  # PC requests to send config
 
-USB_CHUNK_SIZE = 512
+USB_CHUNK_SIZE = 512  # Default chunk size; what current firmware expects
+USB_MAX_CHUNK_SIZE = 0xFFFF - 4  # Packet length field is uint16, minus chunk header
+USB_MAX_CHUNKS = 0x10000  # chunk_number field is uint16
 USB_TIMEOUT = 30.0  # seconds
 
+# Native USB CDC ignores the baudrate, but external UART bridges (FTDI,
+# CH340) are capped by it, so default to the fastest common UART rate
+USB_DEFAULT_BAUDRATE = 921600
+
+ASYNC_LOW_LATENCY = 0x2000  # serial_struct.flags bit, linux/tty_flags.h
+WIN_DRIVER_QUEUE_SIZE = 64 * 1024  # SetupComm rx/tx queue bytes on Windows
+
+# Chunks sent ahead of their ACKs. 1 is classic stop-and-wait; larger
+# windows rely on the device buffering chunks and ACKing them in order
+USB_SEND_WINDOW = 1
+
+# Below this size building an ndarray costs more than the integer fold
+CHECKSUM_NUMPY_MIN_LEN = 32
+
 class USBSender:
-    def __init__(self, port, config_dir, baudrate=115200):
+    # Precompiled packet layouts, so hot paths don't re-parse format strings
+    _HDR = struct.Struct('<HBHB')       # magic(2) + command(1) + length(2) + checksum(1)
+    _HDR_CRC32 = struct.Struct('<HBHI') # magic(2) + command(1) + length(2) + crc32(4)
+    _HANDSHAKE = struct.Struct('<BI')   # version/file_index(1) + timestamp/file_size(4)
+    _CHUNK_HDR = struct.Struct('<HH')   # chunk_number(2) + chunk_size(2)
+    _DIGEST = struct.Struct('<I')       # FILE_END payload: crc32(4) of whole file
+    _MAGIC = USB_PROTO_MAGIC.to_bytes(2, 'little')  # 0x55 0xAA on the wire
+    
+    def __init__(self, port, config_dir, baudrate=USB_DEFAULT_BAUDRATE, window=USB_SEND_WINDOW,
+                 chunk_size=USB_CHUNK_SIZE, crc32=False, digest=False):
         """Initialize USB sender.
         
         Args:
             port: Serial port name (e.g., /dev/ttyACM0 or COM3)
             config_dir: Directory containing config files to send
-            baudrate: Serial baudrate (default 115200)
+            baudrate: Serial baudrate (default 921600)
+            window: Chunks in flight before waiting for an ACK (default 1)
+            chunk_size: Data bytes per chunk (default 512); larger sizes
+                need firmware built with a matching receive buffer
+            crc32: Use 4-byte CRC32 packet checksums instead of XOR-8
+                (needs firmware built with the CRC32 protocol variant)
+            digest: Send a FILE_END packet with the CRC32 of the whole file
+                after the last chunk (needs firmware that checks it)
         """
         self.port = port
         self.config_dir = Path(config_dir)
         self.baudrate = baudrate
+        self.window = max(1, window)
+        if not 1 <= chunk_size <= USB_MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be 1-{USB_MAX_CHUNK_SIZE}, got {chunk_size}")
+        self.chunk_size = chunk_size
+        self.crc32 = crc32
+        self._hdr = self._HDR_CRC32 if crc32 else self._HDR
+        self.digest = digest
+        self._rx_buf = bytearray()  # Bytes read ahead of the current packet
         self.ser = None
         
+        # ACK/NACK never change, so build them once instead of per packet
+        self._ack_pkt = self.build_packet(USB_PROTO_CMD_ACK, b'')
+        self._nack_pkt = self.build_packet(USB_PROTO_CMD_NACK, b'')
+        
         print(f"USB Sender initialized")
         print(f"  Port: {port}")
         print(f"  Config directory: {self.config_dir.absolute()}")
         print(f"  Baudrate: {baudrate}")
+        if self.window > 1:
+            print(f"  Send window: {self.window} chunks")
+        if self.crc32:
+            print(f"  Checksum: CRC32")
+        if self.digest:
+            print(f"  File digest: CRC32 in FILE_END")
+        if self.chunk_size != USB_CHUNK_SIZE:
+            print(f"  Chunk size: {self.chunk_size} bytes")
     
     def connect(self):
         """Open serial port connection."""
@@ -64,75 +123,201 @@ class USBSender:
                 write_timeout=USB_TIMEOUT
             )
             print(f"✓ Connected to {self.port}")
+            self.enable_low_latency()
+            self.set_driver_queue_size()
             # Flush any existing data
             self.ser.reset_input_buffer()
             self.ser.reset_output_buffer()
+            self._rx_buf.clear()
             time.sleep(0.5)  # Give device time to stabilize
             return True
         except serial.SerialException as e:
             print(f"✗ Failed to open port {self.port}: {e}")
             return False
     
+    def enable_low_latency(self):
+        """Ask the tty driver to deliver received bytes immediately.
+        
+        USB serial drivers (FTDI, CH340, CDC-ACM) otherwise batch input for
+        up to ~16 ms, which is added to every ACK round-trip. VMIN/VTIME
+        are left alone: pyserial opens POSIX ports O_NONBLOCK and reads via
+        select() + os.read(), so they have no effect. Failure is not fatal.
+        """
+        if os.name == 'nt':
+            return  # No tty low-latency flag on Windows
+        
+        try:
+            try:
+                self.ser.set_low_latency_mode(True)
+            except AttributeError:
+                # Older pyserial has no helper; set the flag directly
+                self.set_async_low_latency()
+            print("✓ Low-latency mode enabled")
+        except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+            print(f"  Low-latency mode not available: {e}")
+    
+    def set_driver_queue_size(self):
+        """Size the Windows driver queues (SetupComm) to fit a full send window.
+        
+        Windows read timeouts are derived from ser.timeout by pyserial, so
+        SetCommTimeouts is not touched. Failure is not fatal.
+        """
+        if os.name != 'nt':
+            return
+        
+        try:
+            self.ser.set_buffer_size(rx_size=WIN_DRIVER_QUEUE_SIZE,
+                                     tx_size=WIN_DRIVER_QUEUE_SIZE)
+        except (AttributeError, serial.SerialException) as e:
+            print(f"  Driver queue sizing not available: {e}")
+    
+    def set_async_low_latency(self):
+        """Set ASYNC_LOW_LATENCY via TIOCGSERIAL/TIOCSSERIAL (Linux only)."""
+        import array
+        import fcntl
+        import termios
+        
+        # struct serial_struct as ints; flags is the fifth field
+        buf = array.array('i', [0] * 32)
+        fd = self.ser.fileno()
+        fcntl.ioctl(fd, termios.TIOCGSERIAL, buf)
+        buf[4] |= ASYNC_LOW_LATENCY
+        fcntl.ioctl(fd, termios.TIOCSSERIAL, buf)
+    
     def disconnect(self):
         """Close serial port connection."""
         if self.ser and self.ser.is_open:
+            # Nothing else waits for the TX drain, so do it once here before
+            # the last packet can be dropped by close()
+            try:
+                self.ser.flush()
+            except Exception as e:
+                # Device gone (unplug/reset): tcdrain raises termios.error,
+                # which pyserial doesn't wrap; still close the port
+                print(f"  Could not drain output: {e}")
             self.ser.close()
             print("✓ Disconnected")
     
     def calculate_checksum(self, data):
-        """Calculate XOR checksum of data.
+        """Calculate packet checksum of data.
         
         Args:
             data: bytes to checksum
             
         Returns:
-            uint8 checksum value
+            uint8 XOR checksum value, or uint32 CRC32 in CRC32 mode
         """
-        checksum = 0
-        for byte in data:
-            checksum ^= byte
+        if self.crc32:
+            return zlib.crc32(data) & 0xFFFFFFFF
+        
+        if not data:
+            return 0
+        
+        if np is not None and len(data) >= CHECKSUM_NUMPY_MIN_LEN:
+            arr = np.frombuffer(data, dtype=np.uint8)
+            return int(np.bitwise_xor.reduce(arr)) & 0xFF
+        
+        # Without NumPy, treat the data as one big integer and fold it in
+        # half repeatedly: each XOR/shift runs in C over the whole buffer,
+        # so the loop runs log2(len) times instead of once per byte
+        checksum = int.from_bytes(data, 'little')
+        width = 8
+        while width < len(data) * 8:
+            width <<= 1
+        while width > 8:
+            width >>= 1
+            checksum = (checksum ^ (checksum >> width)) & ((1 << width) - 1)
         return checksum & 0xFF
     
+    def build_packet(self, command, data):
+        """Build a complete packet.
+        
+        Args:
+            command: Protocol command byte
+            data: Packet payload bytes
+            
+        Returns:
+            bytes: magic(2) + command(1) + length(2) + checksum(1 or 4) + data
+        """
+        header = self._hdr.pack(USB_PROTO_MAGIC, command, len(data),
+                                self.calculate_checksum(data))
+        return header + data
+    
     def send_ack(self):
         """Send ACK packet to ESP32."""
-        packet = struct.pack('<HBH', USB_PROTO_MAGIC, USB_PROTO_CMD_ACK, 0)
-        checksum = self.calculate_checksum(packet[6:])  # Checksum of empty data
-        packet += struct.pack('B', checksum)
-        
-        self.ser.write(packet)
-        self.ser.flush()
+        self.ser.write(self._ack_pkt)
     
     def send_nack(self):
         """Send NACK packet to ESP32."""
-        packet = struct.pack('<HBH', USB_PROTO_MAGIC, USB_PROTO_CMD_NACK, 0)
-        checksum = self.calculate_checksum(packet[6:])
-        packet += struct.pack('B', checksum)
+        self.ser.write(self._nack_pkt)
+    
+    def fill_rx_buffer(self, count):
+        """Fill the read-ahead buffer to at least count bytes.
         
-        self.ser.write(packet)
-        self.ser.flush()
+        Whatever is already waiting in the driver is pulled in with the
+        requested bytes, so a header and its payload normally arrive in a
+        single ser.read() call and the payload is served from the buffer.
+        
+        Args:
+            count: Number of bytes wanted in the buffer
+        """
+        needed = count - len(self._rx_buf)
+        if needed > 0:
+            self._rx_buf += self.ser.read(max(needed, self.ser.in_waiting))
+    
+    def read_bytes(self, count):
+        """Read count bytes, coalescing serial reads.
+        
+        Args:
+            count: Number of bytes to read
+            
+        Returns:
+            bytes: Data read (shorter than count on timeout)
+        """
+        self.fill_rx_buffer(count)
+        data = bytes(self._rx_buf[:count])
+        del self._rx_buf[:count]
+        return data
+    
+    def skip_to_magic(self):
+        """Drop buffered bytes before the next 0x55 0xAA packet magic."""
+        rx_buf = self._rx_buf
+        start = rx_buf.find(self._MAGIC)
+        if start < 0:
+            # Keep a trailing 0x55, it may be the first magic byte
+            start = len(rx_buf) - rx_buf.endswith(self._MAGIC[:1])
+        if start:
+            print(f"✗ Skipped {start} bytes before packet magic")
+            del rx_buf[:start]
     
     def read_packet_header(self):
-        """Read packet header from serial port.
+        """Read the next packet header, resyncing on the magic.
+        
+        Bytes before the next 0x55 0xAA (debug prints, reset noise) are
+        skipped rather than parsed as a header, so a stray byte can't shift
+        every packet after it. A header cut short by the timeout stays
+        buffered for the next call. At most one blocking read is made, so
+        callers can bound their wait by adjusting ser.timeout. Serial
+        errors (e.g. device unplugged) propagate to the caller.
         
         Returns:
-            tuple: (magic, command, length, checksum) or None if invalid
+            tuple: (magic, command, length, checksum), or None if no
+            complete header arrived within the port timeout
         """
-        try:
-            # Read header: magic(2) + command(1) + length(2) + checksum(1)
-            header = self.ser.read(6)
-            if len(header) != 6:
+        header_size = self._hdr.size
+        rx_buf = self._rx_buf
+        
+        self.skip_to_magic()
+        if len(rx_buf) < header_size:
+            self.fill_rx_buffer(header_size)
+            self.skip_to_magic()
+            if len(rx_buf) < header_size:
                 return None
-            
-            magic, command, length, checksum = struct.unpack('<HBHB', header)
-            
-            if magic != USB_PROTO_MAGIC:
-                print(f"✗ Invalid magic: 0x{magic:04X}")
-                return None
-            
-            return (magic, command, length, checksum)
-        except Exception as e:
-            print(f"✗ Error reading header: {e}")
-            return None
+        
+        # Header: magic(2) + command(1) + length(2) + checksum(1 or 4)
+        header = self._hdr.unpack_from(rx_buf)
+        del rx_buf[:header_size]
+        return header
     
     def wait_for_handshake(self, timeout=30.0):
         """Wait for handshake from device after it enters receive mode.
@@ -140,10 +325,14 @@ class USBSender:
         Returns:
             bool: True if handshake received
         """
-        start_time = time.time()
+        deadline = time.time() + timeout
+        saved_timeout = self.ser.timeout
         
-        while time.time() - start_time < timeout:
-            if self.ser.in_waiting > 0:
+        # Block in ser.read() until bytes arrive instead of polling in_waiting,
+        # so the handshake is handled as soon as it lands
+        try:
+            while time.time() < deadline:
+                self.ser.timeout = max(deadline - time.time(), 0)
                 header = self.read_packet_header()
                 if header is None:
                     continue
@@ -152,7 +341,7 @@ class USBSender:
                 
                 if command == USB_PROTO_CMD_HANDSHAKE:
                     # Read handshake data
-                    data = self.ser.read(length)
+                    data = self.read_bytes(length)
                     if len(data) != length:
                         continue
                     
@@ -162,14 +351,14 @@ class USBSender:
                         self.send_nack()
                         continue
                     
-                    version, timestamp = struct.unpack('<BI', data)
+                    version, timestamp = self._HANDSHAKE.unpack_from(data)
                     print(f"✓ Device ready (version: {version}, timestamp: {timestamp})")
                     
                     # Send ACK
                     self.send_ack()
                     return True
-            
-            time.sleep(0.1)
+        finally:
+            self.ser.timeout = saved_timeout
         
         print(f"\n✗ Timeout after {timeout}s - Device did not respond")
         print("   Make sure you pressed 'Receive Config' button on device!")
@@ -250,100 +439,223 @@ class USBSender:
         print(f"   Index: {file_index}")
         
         # Build packet: magic(2) + command(1) + length(2) + checksum(1) + file_index(1) + file_size(4) + filename(64)
-        filename_bytes = filename.encode('utf-8')[:64].ljust(64, b'\x00')
-        data = struct.pack('<BI', file_index, filesize) + filename_bytes
-        
-        packet = struct.pack('<HBH', USB_PROTO_MAGIC, USB_PROTO_CMD_FILE_DATA, len(data))
-        checksum = self.calculate_checksum(data)
-        packet += struct.pack('B', checksum) + data
+        # in one preallocated buffer; the zero fill doubles as filename padding
+        header_size = self._hdr.size
+        name_offset = header_size + self._HANDSHAKE.size
+        length = self._HANDSHAKE.size + 64
+        packet = bytearray(header_size + length)
+        filename_bytes = filename.encode('utf-8')[:64]
+        packet[name_offset:name_offset + len(filename_bytes)] = filename_bytes
+        
+        self._HANDSHAKE.pack_into(packet, header_size, file_index, filesize)
+        with memoryview(packet) as packet_view:
+            checksum = self.calculate_checksum(packet_view[header_size:])
+        self._hdr.pack_into(packet, 0, USB_PROTO_MAGIC,
+                            USB_PROTO_CMD_FILE_DATA, length, checksum)
         
         self.ser.write(packet)
-        self.ser.flush()
         
         # Wait for ACK
         return self.wait_for_ack(5.0)
     
-    def send_file_chunks(self, filepath, filesize):
+    def build_chunk_packet(self, chunk_number, chunk_data):
+        """Build the FILE_DATA packet for one chunk.
+        
+        Args:
+            chunk_number: Sequence number to put in the chunk header
+            chunk_data: Chunk bytes (bytes or memoryview slice)
+            
+        Returns:
+            bytearray: Complete packet
+        """
+        # magic(2) + command(1) + length(2) + checksum(1) + chunk_number(2) + chunk_size(2) + data[chunk_size]
+        header_size = self._hdr.size
+        length = self._CHUNK_HDR.size + len(chunk_data)
+        packet = bytearray(header_size + length)
+        packet[header_size + self._CHUNK_HDR.size:] = chunk_data
+        
+        # Fill in chunk header, then packet header over the payload
+        self._CHUNK_HDR.pack_into(packet, header_size, chunk_number, len(chunk_data))
+        with memoryview(packet) as packet_view:
+            checksum = self.calculate_checksum(packet_view[header_size:])
+        self._hdr.pack_into(packet, 0, USB_PROTO_MAGIC,
+                            USB_PROTO_CMD_FILE_DATA, length, checksum)
+        return packet
+    
+    def _prepare_packets(self, data, chunk_size):
+        """Build every FILE_DATA packet for a file up front.
+        
+        Config files are a few KB, so holding all packets costs little and
+        keeps struct packing and checksums out of the send/ACK loop: the
+        next packet is always ready while an ACK is awaited.
+        
+        Args:
+            data: Complete file contents
+            chunk_size: Maximum data bytes per chunk
+            
+        Returns:
+            list: (chunk_size, packet) for each chunk, in order
+        """
+        packets = []
+        with memoryview(data) as view:
+            for chunk_number, offset in enumerate(range(0, len(data), chunk_size)):
+                with view[offset:offset + chunk_size] as chunk_data:
+                    packets.append((len(chunk_data),
+                                    self.build_chunk_packet(chunk_number, chunk_data)))
+        return packets
+    
+    def send_file_chunks(self, packets, filesize):
         """Send file data in chunks.
         
         Args:
-            filepath: Path to file
+            packets: (chunk_size, packet) list from _prepare_packets()
             filesize: Size of file
             
         Returns:
             bool: True if all chunks sent successfully
         """
-        print(f"\n📦 Sending file chunks...")
+        print(f"\n📦 Sending file chunks ({self.chunk_size} bytes each)...")
         
-        chunk_number = 0
-        total_sent = 0
+        total_acked = 0
+        next_packet = 0
+        in_flight = deque()  # Sizes of chunks sent but not yet ACKed, oldest first
         
-        with open(filepath, 'rb') as f:
-            while total_sent < filesize:
-                # Read chunk
-                chunk_data = f.read(USB_CHUNK_SIZE)
-                if not chunk_data:
-                    break
-                
-                chunk_size = len(chunk_data)
-                
-                # Build packet: magic(2) + command(1) + length(2) + checksum(1) + chunk_number(2) + chunk_size(2) + data[512]
-                chunk_header = struct.pack('<HH', chunk_number, chunk_size)
-                data = chunk_header + chunk_data
-                
-                packet = struct.pack('<HBH', USB_PROTO_MAGIC, USB_PROTO_CMD_FILE_DATA, len(data))
-                checksum = self.calculate_checksum(data)
-                packet += struct.pack('B', checksum) + data
+        while total_acked < filesize:
+            # Keep up to self.window chunks in flight before waiting
+            while next_packet < len(packets) and len(in_flight) < self.window:
+                chunk_size, packet = packets[next_packet]
                 
+                # No flush: write() has handed the bytes to the driver, and
+                # the blocking ACK read below already waits for them to land
                 self.ser.write(packet)
-                self.ser.flush()
-                
-                # Wait for ACK
-                if not self.wait_for_ack(5.0):
-                    print(f"✗ Failed to get ACK for chunk {chunk_number}")
-                    return False
                 
-                total_sent += chunk_size
-                chunk_number += 1
-                
-                # Progress
-                progress = (total_sent / filesize) * 100
-                print(f"   Progress: {progress:.1f}% ({total_sent}/{filesize} bytes, chunk {chunk_number})", end='\r')
+                in_flight.append(chunk_size)
+                next_packet += 1
+            
+            # Wait for ACK of the oldest chunk in flight (device ACKs in order)
+            if not self.wait_for_ack(5.0):
+                print(f"✗ Failed to get ACK for chunk {next_packet - len(in_flight)}")
+                return False
+            
+            total_acked += in_flight.popleft()
+            
+            # Progress
+            progress = (total_acked / filesize) * 100
+            print(f"   Progress: {progress:.1f}% ({total_acked}/{filesize} bytes, chunk {next_packet - len(in_flight)})", end='\r')
         
         print()  # New line
         return True
     
+    def send_file_end(self, data):
+        """Send the whole-file CRC32 and wait for the device to confirm it.
+        
+        Args:
+            data: Complete file contents as sent
+            
+        Returns:
+            bool: True if the device ACKed the digest
+        """
+        # magic(2) + command(1) + length(2) + checksum(1) + crc32(4)
+        crc = zlib.crc32(data) & 0xFFFFFFFF
+        self.ser.write(self.build_packet(USB_PROTO_CMD_FILE_END, self._DIGEST.pack(crc)))
+        
+        if not self.wait_for_ack(5.0):
+            print(f"✗ Device rejected file digest (CRC32 0x{crc:08X})")
+            return False
+        
+        print(f"✓ File digest verified (CRC32 0x{crc:08X})")
+        return True
+    
     def wait_for_ack(self, timeout):
         """Wait for ACK packet.
         
         Returns:
             bool: True if ACK received
         """
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if self.ser.in_waiting >= 6:
-                header = self.read_packet_header()
-                if header is None:
-                    continue
-                
+        # Every ser.timeout assignment reconfigures the port (tcsetattr on
+        # POSIX, SetCommTimeouts + SetCommState on Windows), so set it once
+        # and leave it while it matches; the same timeout is used per chunk
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+        deadline = time.time() + timeout
+        
+        # Block in ser.read() until the ACK arrives instead of polling in_waiting
+        while True:
+            header = self.read_packet_header()
+            if header is not None:
                 magic, command, length, checksum = header
                 
                 if command == USB_PROTO_CMD_ACK:
                     # Read any remaining data
                     if length > 0:
-                        self.ser.read(length)
+                        self.read_bytes(length)
                     return True
                 elif command == USB_PROTO_CMD_NACK:
                     return False
             
-            time.sleep(0.05)
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            
+            # Noise or another packet arrived first (rare): shorten the next
+            # read so the wait still ends at the deadline
+            self.ser.timeout = remaining
+    
+    def send_selected(self, filename, filepath, file_index):
+        """Send one config file over the open connection.
         
-        return False
+        Args:
+            filename: Name of file
+            filepath: Path to file
+            file_index: Index (1-4 for setting_1 to setting_4)
+            
+        Returns:
+            bool: True if successful
+        """
+        # Read the file and build every packet before announcing it, so read
+        # errors surface early and nothing but writes and ACK reads happens
+        # once the device is waiting for chunk 0
+        try:
+            data = Path(filepath).read_bytes()
+        except OSError as e:
+            print(f"✗ Failed to read {filepath}: {e}")
+            return False
+        filesize = len(data)
+        
+        # chunk_number is uint16; refuse before the device is told about the file
+        num_chunks = (filesize + self.chunk_size - 1) // self.chunk_size
+        if num_chunks > USB_MAX_CHUNKS:
+            print(f"✗ {filename} needs {num_chunks} chunks of {self.chunk_size} bytes "
+                  f"(max {USB_MAX_CHUNKS}); use a larger --chunk-size")
+            return False
+        packets = self._prepare_packets(data, self.chunk_size)
+        
+        # Send file info
+        if not self.send_file_info(filename, filesize, file_index):
+            print("✗ Device did not acknowledge file info")
+            return False
+        
+        # Send file chunks
+        if not self.send_file_chunks(packets, filesize):
+            print("✗ Failed to send file chunks")
+            return False
+        
+        if self.digest and not self.send_file_end(data):
+            return False
+        
+        print("\n" + "="*60)
+        print(f"✓ TRANSFER COMPLETE: {filename} sent successfully!")
+        print("="*60)
+        
+        return True
     
-    def send_config_file(self):
+    def send_config_file(self, file_index=None, send_all=False):
         """Main function to send config file.
         
+        Args:
+            file_index: Send setting_<file_index>.csv without asking (optional)
+            send_all: Send every available config file over one connection
+            
         Returns:
             bool: True if successful
         """
@@ -359,18 +671,32 @@ class USBSender:
             print("   Expected files: setting_1.csv, setting_2.csv, setting_3.csv, setting_4.csv")
             return False
         
-        # User selects file (BEFORE connecting to device)
-        selected = self.select_config_file(config_files)
-        if selected is None:
-            return False
+        # Pick files (BEFORE connecting to device): all, by index, or from the menu
+        if send_all:
+            selected_files = config_files
+        elif file_index is not None:
+            wanted = f"setting_{file_index}.csv"
+            selected_files = [entry for entry in config_files if entry[0] == wanted]
+            if not selected_files:
+                print(f"\n✗ {wanted} not found in: {self.config_dir}")
+                return False
+        else:
+            selected = self.select_config_file(config_files)
+            if selected is None:
+                return False
+            selected_files = [selected]
         
-        filename, filepath = selected
+        return self.send_config_files(selected_files)
+    
+    def _setup_connection(self):
+        """Open the port and let it settle, unless already connected.
         
-        # Extract file index (1-4) from filename
-        file_index = int(filename.split('_')[1].split('.')[0])
-        filesize = filepath.stat().st_size
+        Returns:
+            bool: True if the device is connected
+        """
+        if self.ser and self.ser.is_open:
+            return True
         
-        print(f"\n📋 Selected: {filename} ({filesize} bytes)")
         print("="*60)
         print("⏳ Connecting to device...")
         print("   Press 'Receive Config' button on device if not already pressed")
@@ -383,20 +709,32 @@ class USBSender:
         
         # Small delay for USB to stabilize
         time.sleep(0.5)
+        return True
+    
+    def send_config_files(self, selected_files):
+        """Send config files back-to-back over one connection.
         
-        # Send file info immediately
-        if not self.send_file_info(filename, filesize, file_index):
-            print("✗ Device did not acknowledge file info")
-            return False
+        The connection is left open, so later calls (e.g. repeated
+        send_config_file() calls) skip the connect and stabilize delays;
+        disconnect() closes it.
         
-        # Send file chunks
-        if not self.send_file_chunks(filepath, filesize):
-            print("✗ Failed to send file chunks")
+        Args:
+            selected_files: List of (filename, filepath) tuples
+            
+        Returns:
+            bool: True if all files were sent
+        """
+        for filename, filepath in selected_files:
+            print(f"\n📋 Selected: {filename} ({filepath.stat().st_size} bytes)")
+        
+        if not self._setup_connection():
             return False
         
-        print("\n" + "="*60)
-        print(f"✓ TRANSFER COMPLETE: {filename} sent successfully!")
-        print("="*60)
+        for filename, filepath in selected_files:
+            # Extract file index (1-4) from filename
+            index = int(filename.split('_')[1].split('.')[0])
+            if not self.send_selected(filename, filepath, index):
+                return False
         
         return True
 
@@ -426,6 +764,12 @@ Examples:
   # Send config from specific directory
   python usb_sender.py --port COM3 --config-dir ./send_settings
   
+  # Send setting_2.csv without the interactive menu
+  python usb_sender.py --port /dev/ttyACM0 --file 2
+  
+  # Send all config files over one connection
+  python usb_sender.py --port /dev/ttyACM0 --all
+  
   # List available serial ports
   python usb_sender.py --list-ports
         """
@@ -435,23 +779,40 @@ Examples:
                         help='Serial port (default: /dev/ttyACM0, or COM3 on Windows)')
     parser.add_argument('--config-dir', '-c', default='./send_settings',
                         help='Directory containing config files (default: ./send_settings)')
-    parser.add_argument('--baudrate', '-b', type=int, default=115200,
-                        help='Serial baudrate (default: 115200)')
+    parser.add_argument('--baudrate', '-b', type=int, default=USB_DEFAULT_BAUDRATE,
+                        help=f'Serial baudrate (default: {USB_DEFAULT_BAUDRATE})')
+    parser.add_argument('--window', '-w', type=int, default=USB_SEND_WINDOW,
+                        help='Chunks sent ahead of their ACKs (default: 1, stop-and-wait)')
+    parser.add_argument('--chunk-size', type=int, default=USB_CHUNK_SIZE,
+                        help=f'Data bytes per chunk; >{USB_CHUNK_SIZE} needs matching firmware (default: {USB_CHUNK_SIZE})')
+    parser.add_argument('--crc32', action='store_true',
+                        help='Use CRC32 packet checksums; needs matching firmware')
+    parser.add_argument('--digest', action='store_true',
+                        help='Send a whole-file CRC32 after the last chunk; needs matching firmware')
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--file', '-f', type=int, choices=[1, 2, 3, 4],
+                           help='Send setting_N.csv without the interactive menu')
+    selection.add_argument('--all', '-a', action='store_true',
+                           help='Send all config files back-to-back over one connection')
     parser.add_argument('--list-ports', '-l', action='store_true',
                         help='List available serial ports and exit')
     
     args = parser.parse_args()
     
+    if not 1 <= args.chunk_size <= USB_MAX_CHUNK_SIZE:
+        parser.error(f"--chunk-size must be between 1 and {USB_MAX_CHUNK_SIZE}")
+    
     if args.list_ports:
         list_serial_ports()
         return 0
     
     # Create sender (DON'T connect yet - will connect after file selection)
-    sender = USBSender(args.port, args.config_dir, args.baudrate)
+    sender = USBSender(args.port, args.config_dir, args.baudrate, args.window,
+                       args.chunk_size, args.crc32, args.digest)
     
     try:
         # Send config file (this will connect at the right time)
-        success = sender.send_config_file()
+        success = sender.send_config_file(args.file, args.all)
         return 0 if success else 1
     except KeyboardInterrupt:
         print("\n\n✗ Transfer interrupted by user")